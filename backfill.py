@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Backfill d'une longue période historique.
+
+La période est découpée en shards exécutés en parallèle dans un pool de
+processus : une plage de pages du listing SeneNews (les pages couvrant la
+période sont localisées par dichotomie sur leurs dates) ou une rubrique Senego. Chaque shard écrit ses articles par lots
+dans son propre journal (voir ``CrawlCheckpoint``) et peut être repris après
+interruption ; le processus principal fusionne chaque shard terminé dans le CSV
+principal et tient à jour ``progress.json``.
+
+Usage:
+    python backfill.py 2025-01-01 2025-12-31 --workers 4
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from scraper import CrawlCheckpoint, UnifiedNewsScraper
+
+BACKFILL_DIR = '.cache/backfill'
+
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def first_page_where(scraper, condition, max_pages, page_dates):
+    """Première page du listing SeneNews dont la date vérifie ``condition`` (None si aucune)"""
+    def page_date(page):
+        if page not in page_dates:
+            page_dates[page] = scraper.senenews_page_date(page)
+            if page_dates[page] is None:
+                raise RuntimeError(f"date de la page {page} introuvable")
+        return page_dates[page]
+
+    lo, hi = 1, max_pages
+    if not condition(page_date(hi)):
+        return None
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if condition(page_date(mid)):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def locate_senenews_pages(scraper, start_date, end_date, max_pages):
+    """Plage de pages SeneNews couvrant la période ; la fin vaut None si elle dépasse max_pages"""
+    page_dates = {}
+    first = first_page_where(scraper, lambda d: d <= end_date, max_pages, page_dates)
+    if first is None:
+        return max_pages, None
+    last = first_page_where(scraper, lambda d: d < start_date, max_pages, page_dates)
+    # La page précédente peut déjà contenir des articles de la période
+    return max(1, first - 1), last
+
+
+def senenews_shards(scraper, start_date, end_date, max_pages, pages_per_shard):
+    """Découpe le listing SeneNews en plages de pages indépendantes"""
+    try:
+        first, last = locate_senenews_pages(scraper, start_date, end_date, max_pages)
+    except RuntimeError as e:
+        print(f"⚠️ Localisation des pages SeneNews impossible ({e}): un seul shard depuis la page 1")
+        first, last = 1, None
+    print(f"📍 SeneNews: pages {first} à {last or f'{max_pages} (max)'}")
+
+    shards = []
+    end = last or max_pages
+    for page in range(first, end + 1, pages_per_shard):
+        shards.append({
+            'id': f"senenews-p{page:04d}",
+            'source': 'SeneNews',
+            'rubrique': 'actualites',
+            'url': None,
+            'first_page': page,
+            # Une page de recouvrement absorbe le décalage dû aux articles publiés
+            # entre-temps ; le dernier shard continue jusqu'aux articles trop anciens
+            'last_page': page + pages_per_shard if page + pages_per_shard <= end else None,
+        })
+    return shards
+
+
+def build_shards(start_date, end_date, max_pages, pages_per_shard):
+    """Liste les shards à traiter: plages de pages SeneNews + chaque rubrique Senego"""
+    scraper = UnifiedNewsScraper(main_csv_file=None, checkpoint_dir=None)
+    shards = senenews_shards(scraper, start_date, end_date, max_pages, pages_per_shard)
+
+    themes_dict = scraper.get_senego_themes()
+    if themes_dict is None:
+        print("⚠️ Menu Senego indisponible: seul SeneNews sera traité")
+        themes_dict = {}
+
+    for theme, url in themes_dict.items():
+        shards.append({'id': f"senego-{slugify(theme)}", 'source': 'Senego', 'rubrique': theme, 'url': url})
+    return shards
+
+
+def shard_run_key(shard_id, start_date, end_date):
+    # max_pages n'en fait pas partie: relancer avec --max-pages plus grand
+    # reprend un shard arrêté faute de pages au lieu de le recommencer
+    return {
+        'shard': shard_id,
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+    }
+
+
+def shard_section(shard):
+    """Nom de la section du checkpoint correspondant au shard"""
+    return 'senenews' if shard['source'] == 'SeneNews' else f"senego:{shard['rubrique']}"
+
+
+def run_shard(shard, start_date, end_date, max_pages, main_csv_file, backfill_dir, batch_size):
+    """Exécute un shard dans un processus du pool.
+
+    Retourne ``(articles journalisés, shard complet)`` : un shard dont une page de
+    listing n'a pas pu être chargée n'est pas complet et doit être relancé.
+    """
+    scraper = UnifiedNewsScraper(
+        main_csv_file,
+        checkpoint_dir=os.path.join(backfill_dir, shard['id']),
+        flush_every=batch_size
+    )
+    run_key = shard_run_key(shard['id'], start_date, end_date)
+    # Pas d'expiration: un backfill peut être repris plusieurs jours après
+    start_date, end_date = scraper.open_checkpoint(run_key, start_date, end_date,
+                                                  max_age_hours=None, extend_window=False)
+
+    try:
+        if shard['source'] == 'SeneNews':
+            scraper.scrape_senenews(start_date, end_date, max_pages, shard['first_page'], shard['last_page'])
+        else:
+            scraper.scrape_senego_theme(shard['rubrique'], shard['url'], start_date, end_date, max_pages)
+    finally:
+        scraper.flush_articles()
+
+    n_articles = sum(1 for _ in scraper.checkpoint.iter_records())
+    return n_articles, scraper.checkpoint.is_section_done(shard_section(shard))
+
+
+class BackfillRunner:
+    def __init__(self, start_date, end_date, main_csv_file='articles_scraped.csv',
+                 backfill_dir=BACKFILL_DIR, workers=4, max_pages=1000, batch_size=50,
+                 merge_batch_size=1000, pages_per_shard=20):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.main_csv_file = main_csv_file
+        self.backfill_dir = backfill_dir
+        self.workers = workers
+        self.max_pages = max_pages
+        self.batch_size = batch_size
+        self.merge_batch_size = merge_batch_size
+        self.pages_per_shard = pages_per_shard
+        self.progress_file = os.path.join(backfill_dir, 'progress.json')
+
+        os.makedirs(backfill_dir, exist_ok=True)
+        self.progress = self.load_progress()
+
+    def load_progress(self):
+        """Charge l'avancement d'un backfill précédent sur la même période"""
+        run_key = {'start_date': self.start_date.isoformat(), 'end_date': self.end_date.isoformat()}
+        if os.path.exists(self.progress_file):
+            try:
+                with open(self.progress_file, 'r', encoding='utf-8') as f:
+                    progress = json.load(f)
+                if progress.get('run_key') == run_key:
+                    return progress
+                print("ℹ️ Avancement d'une autre période ignoré")
+            except Exception as e:
+                print(f"⚠️ Erreur lecture avancement: {e}")
+        return {'run_key': run_key, 'shards': {}}
+
+    def save_progress(self):
+        tmp_file = self.progress_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.progress, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.progress_file)
+
+    def update_shard(self, shard_id, **fields):
+        self.progress['shards'].setdefault(shard_id, {}).update(fields, updated_at=datetime.now().isoformat())
+        self.save_progress()
+
+    def merge_shard(self, shard_id, complete=True):
+        """Fusionne le journal d'un shard dans le CSV principal, par lots.
+
+        La frontière d'un shard incomplet est conservée pour reprendre ses pages
+        manquantes ; seul son journal, déjà fusionné, est vidé.
+        """
+        checkpoint = CrawlCheckpoint(
+            os.path.join(self.backfill_dir, shard_id),
+            shard_run_key(shard_id, self.start_date, self.end_date),
+            max_age_hours=None
+        )
+        merger = UnifiedNewsScraper(self.main_csv_file, checkpoint_dir=None)
+        merger.checkpoint = checkpoint
+        if not merger.merge_journal(self.merge_batch_size):
+            raise RuntimeError(f"échec de la fusion dans {self.main_csv_file}")
+
+        if complete:
+            checkpoint.clear()
+        else:
+            checkpoint.clear_records()
+
+    def run(self):
+        print(f"🚀 BACKFILL - {self.start_date.strftime('%d/%m/%Y')} → {self.end_date.strftime('%d/%m/%Y')}")
+
+        # Le découpage est conservé: une reprise retrouve les mêmes shards
+        shards = self.progress.get('plan')
+        if shards is None:
+            shards = build_shards(self.start_date, self.end_date, self.max_pages, self.pages_per_shard)
+            self.progress['plan'] = shards
+            self.save_progress()
+        pending = [s for s in shards if self.progress['shards'].get(s['id'], {}).get('status') != 'merged']
+        print(f"🧩 {len(shards)} shards, {len(shards) - len(pending)} déjà terminés, {self.workers} workers")
+
+        for shard in pending:
+            self.update_shard(shard['id'], status='pending', source=shard['source'], rubrique=shard['rubrique'])
+
+        done = len(shards) - len(pending)
+        failed = 0
+        partial = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(run_shard, shard, self.start_date, self.end_date, self.max_pages,
+                                self.main_csv_file, self.backfill_dir, self.batch_size): shard
+                for shard in pending
+            }
+
+            for future in as_completed(futures):
+                shard = futures[future]
+                try:
+                    n_articles, complete = future.result()
+                    self.update_shard(shard['id'], status='scraped', articles=n_articles)
+                    # Seul le processus principal écrit dans le CSV
+                    self.merge_shard(shard['id'], complete)
+                    if complete:
+                        self.update_shard(shard['id'], status='merged')
+                        done += 1
+                        print(f"✅ [{done}/{len(shards)}] {shard['id']}: {n_articles} articles fusionnés")
+                    else:
+                        partial += 1
+                        self.update_shard(shard['id'], status='partial')
+                        print(f"⚠️ Shard {shard['id']} incomplet (pages inaccessibles ou --max-pages atteint): "
+                              f"{n_articles} articles fusionnés, relancer pour reprendre")
+                except Exception as e:
+                    failed += 1
+                    self.update_shard(shard['id'], status='failed', error=str(e))
+                    print(f"❌ Shard {shard['id']} en échec (reprise possible): {e}")
+
+        print(f"\n🎉 BACKFILL TERMINÉ: {done}/{len(shards)} shards fusionnés, "
+              f"{partial} incomplets, {failed} en échec")
+        return failed == 0 and partial == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill historique SeneNews + Senego")
+    parser.add_argument('start', help="Date de début (AAAA-MM-JJ)")
+    parser.add_argument('end', help="Date de fin incluse (AAAA-MM-JJ)")
+    parser.add_argument('--workers', type=int, default=4, help="Nombre de processus")
+    parser.add_argument('--max-pages', type=int, default=1000, help="Pages maximum par shard")
+    parser.add_argument('--pages-per-shard', type=int, default=20, help="Pages SeneNews par shard")
+    parser.add_argument('--batch-size', type=int, default=50, help="Articles par écriture du journal")
+    parser.add_argument('--output', default='articles_scraped.csv', help="Fichier CSV cible")
+    args = parser.parse_args()
+
+    start_date = datetime.strptime(args.start, '%Y-%m-%d')
+    end_date = datetime.strptime(args.end, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
+
+    runner = BackfillRunner(start_date, end_date, main_csv_file=args.output, workers=args.workers,
+                            max_pages=args.max_pages, batch_size=args.batch_size,
+                            pages_per_shard=args.pages_per_shard)
+    try:
+        success = runner.run()
+    except KeyboardInterrupt:
+        print("\n⚠️ Backfill interrompu - relancer la même commande pour reprendre")
+        sys.exit(1)
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
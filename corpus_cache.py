@@ -0,0 +1,219 @@
+# Cache de la matrice document-terme entre deux entraînements
+#
+# La matrice de comptages brute (sans filtrage min_df/max_df) est conservée au
+# format CSR compressé (.npz) avec son vocabulaire et un manifeste des articles
+# couverts (URL + hash du contenu). Au lancement suivant, seules les lignes des
+# articles nouveaux ou modifiés sont prétraitées et vectorisées ; le filtrage
+# min_df/max_df est réappliqué sur les fréquences documentaires des colonnes.
+#
+# Chaque fichier est écrit de manière atomique et le manifeste en dernier ; il
+# contient l'empreinte des deux autres, si bien qu'un cache à moitié écrit est
+# détecté et ignoré au chargement.
+
+import hashlib
+import json
+import os
+from collections import Counter
+from numbers import Integral
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer
+
+from profiling import phase
+
+CACHE_DIR = './.cache/corpus'
+
+
+def file_hash(path):
+    """Empreinte SHA-1 d'un fichier"""
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def content_hash(text):
+    """Hash du contenu brut d'un article"""
+    text = '' if pd.isna(text) else str(text)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class CorpusCache:
+    def __init__(self, cache_dir=CACHE_DIR, signature=''):
+        self.cache_dir = cache_dir
+        self.signature = signature
+        self.counts_file = os.path.join(cache_dir, 'counts.npz')
+        self.vocabulary_file = os.path.join(cache_dir, 'vocabulary.json')
+        self.manifest_file = os.path.join(cache_dir, 'manifest.json')
+
+        self.counts = sp.csr_matrix((0, 0), dtype=np.int64)
+        self.vocabulary = []
+        # clé (url|hash) -> {'url', 'hash', 'row'} ; row = -1 pour un article vide après prétraitement
+        self.documents = {}
+
+    def load(self):
+        """Charge le cache s'il existe et correspond au même prétraitement"""
+        if not all(os.path.exists(f) for f in (self.counts_file, self.vocabulary_file, self.manifest_file)):
+            print("📄 Aucun cache de corpus - vectorisation complète")
+            return False
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('signature') != self.signature:
+                print("ℹ️ Prétraitement modifié - cache de corpus ignoré")
+                return False
+            if (manifest.get('counts_sha1') != file_hash(self.counts_file)
+                    or manifest.get('vocabulary_sha1') != file_hash(self.vocabulary_file)):
+                raise ValueError("fichiers ne correspondant pas au manifeste (écriture interrompue)")
+            with open(self.vocabulary_file, 'r', encoding='utf-8') as f:
+                self.vocabulary = json.load(f)
+            self.counts = sp.load_npz(self.counts_file).tocsr()
+            self.documents = {
+                f"{url}|{h}": {'url': url, 'hash': h, 'row': row}
+                for url, h, row in manifest['documents']
+            }
+            if self.counts.shape[1] != len(self.vocabulary):
+                raise ValueError(f"{self.counts.shape[1]} colonnes pour {len(self.vocabulary)} mots")
+            if any(d['row'] >= self.counts.shape[0] for d in self.documents.values()):
+                raise ValueError(f"ligne du manifeste hors de la matrice ({self.counts.shape[0]} lignes)")
+        except Exception as e:
+            print(f"⚠️ Cache de corpus illisible, ignoré: {e}")
+            self.__init__(self.cache_dir, self.signature)
+            return False
+
+        print(f"📂 Cache de corpus chargé: {self.counts.shape[0]} documents, {len(self.vocabulary)} mots")
+        return True
+
+    def save(self):
+        """Écrit le cache (fichiers temporaires + os.replace, manifeste en dernier)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_file = self.counts_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            sp.save_npz(f, self.counts, compressed=True)
+        os.replace(tmp_file, self.counts_file)
+
+        tmp_file = self.vocabulary_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.vocabulary, f, ensure_ascii=False)
+        os.replace(tmp_file, self.vocabulary_file)
+
+        manifest = {
+            'signature': self.signature,
+            'counts_sha1': file_hash(self.counts_file),
+            'vocabulary_sha1': file_hash(self.vocabulary_file),
+            'documents': [[d['url'], d['hash'], d['row']] for d in self.documents.values()],
+        }
+        tmp_file = self.manifest_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_file, self.manifest_file)
+
+    def update(self, df, preprocess, text_column='contenu', url_column='url', min_length=10):
+        """Met le cache à jour pour les articles de ``df``.
+
+        Retourne ``(mask, rows)`` : le masque des lignes de ``df`` conservées
+        après prétraitement et, pour chacune, sa ligne dans ``self.counts``.
+        """
+        urls = df[url_column].fillna('').astype(str).tolist()
+        hashes = [content_hash(text) for text in df[text_column]]
+        keys = [f"{url}|{h}" for url, h in zip(urls, hashes)]
+
+        # Articles nouveaux ou dont le contenu a changé
+        new_keys = {}
+        for key, url, h, text in zip(keys, urls, hashes, df[text_column]):
+            if key not in self.documents and key not in new_keys:
+                new_keys[key] = (url, h, text)
+        print(f"🔁 {len(set(keys)) - len(new_keys)} articles en cache, {len(new_keys)} à vectoriser")
+
+        # Lignes conservées (articles toujours présents), dans leur ordre actuel
+        wanted = set(keys)
+        kept = [d for k, d in self.documents.items() if k in wanted and d['row'] >= 0]
+        old_rows = np.array([d['row'] for d in kept], dtype=np.int64)
+
+        with phase('preprocess'):
+            cleaned_texts = [preprocess(text) for _, _, text in new_keys.values()]
+
+        # Vectoriser les nouveaux articles avec le vocabulaire étendu
+        analyzer = CountVectorizer().build_analyzer()
+        term_index = {term: i for i, term in enumerate(self.vocabulary)}
+        indptr, indices, data = [0], [], []
+        new_documents = {}
+        n_new_rows = 0
+        for (key, (url, h, _)), cleaned in zip(new_keys.items(), cleaned_texts):
+            if len(cleaned) <= min_length:
+                new_documents[key] = {'url': url, 'hash': h, 'row': -1}
+                continue
+            token_counts = Counter(term_index.setdefault(tok, len(term_index)) for tok in analyzer(cleaned))
+            indices.extend(token_counts.keys())
+            data.extend(token_counts.values())
+            indptr.append(len(indices))
+            new_documents[key] = {'url': url, 'hash': h, 'row': len(kept) + n_new_rows}
+            n_new_rows += 1
+
+        n_terms = len(term_index)
+        old_counts = self.counts[old_rows] if len(old_rows) else sp.csr_matrix((0, len(self.vocabulary)), dtype=np.int64)
+        old_counts = sp.csr_matrix((old_counts.data, old_counts.indices, old_counts.indptr), shape=(len(kept), n_terms))
+        new_counts = sp.csr_matrix((data, indices, indptr), shape=(n_new_rows, n_terms), dtype=np.int64)
+        counts = sp.vstack([old_counts, new_counts], format='csr')
+
+        # Retirer les mots qui n'apparaissent plus dans aucun article
+        vocabulary = np.array(list(term_index), dtype=object)
+        used = np.bincount(counts.indices, minlength=n_terms) > 0
+        if not used.all():
+            counts = counts[:, np.flatnonzero(used)]
+            vocabulary = vocabulary[used]
+
+        self.counts = counts.tocsr()
+        self.vocabulary = vocabulary.tolist()
+        documents = {k: dict(d) for k, d in self.documents.items() if k in wanted and d['row'] < 0}
+        for i, d in enumerate(kept):
+            documents[f"{d['url']}|{d['hash']}"] = {**d, 'row': i}
+        documents.update(new_documents)
+        self.documents = documents
+
+        rows = np.array([self.documents[key]['row'] for key in keys], dtype=np.int64)
+        mask = rows >= 0
+        return mask, rows[mask]
+
+
+def filter_vocabulary(counts, vocabulary, min_df=2, max_df=0.95):
+    """Applique min_df/max_df comme CountVectorizer et retourne (X, vectorizer ajusté)"""
+    n_docs = counts.shape[0]
+    doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+    max_doc_count = max_df if isinstance(max_df, Integral) else max_df * n_docs
+    min_doc_count = min_df if isinstance(min_df, Integral) else min_df * n_docs
+    keep = np.flatnonzero((doc_freq >= min_doc_count) & (doc_freq <= max_doc_count))
+
+    # Colonnes triées par ordre alphabétique, comme CountVectorizer
+    terms = np.array(vocabulary, dtype=object)[keep]
+    order = np.argsort(terms)
+    X = counts[:, keep[order]].tocsr()
+    X.sort_indices()
+
+    vectorizer = CountVectorizer(max_df=max_df, min_df=min_df)
+    vectorizer.vocabulary_ = {term: i for i, term in enumerate(terms[order])}
+    vectorizer.fixed_vocabulary_ = False
+    return X, vectorizer
+
+
+def build_document_term_matrix(df, preprocess, signature='', min_df=2, max_df=0.95,
+                               cache_dir=CACHE_DIR, text_column='contenu', url_column='url'):
+    """Équivalent de ``CountVectorizer(min_df, max_df).fit_transform`` avec cache incrémental.
+
+    Retourne ``(df_kept, X, vectorizer)`` où ``df_kept`` contient les articles
+    non vides après prétraitement, dans l'ordre des lignes de ``X``.
+    """
+    cache = CorpusCache(cache_dir, signature)
+    with phase('cache_load'):
+        cache.load()
+    with phase('vectorize'):
+        mask, rows = cache.update(df, preprocess, text_column=text_column, url_column=url_column)
+    with phase('cache_save'):
+        cache.save()
+
+    with phase('vocabulary_filter'):
+        X, vectorizer = filter_vocabulary(cache.counts[rows], cache.vocabulary, min_df, max_df)
+    return df[mask], X, vectorizer
@@ -2,6 +2,10 @@
 import pandas as pd
 import re
 import os
+import sys
+import json
+import hashlib
+from datetime import datetime
 
 # Traitement de texte
 import nltk
@@ -9,8 +13,12 @@ from nltk.corpus import stopwords
 from unidecode import unidecode
 
 # Modélisation thématique
-from sklearn.feature_extraction.text import CountVectorizer, ENGLISH_STOP_WORDS
-from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from corpus_cache import build_document_term_matrix
+from lda_selection import check_sklearn_internals, make_lda, sweep_n_components, warm_start
+from topic_quality import binarize, topic_coherence, topic_quality_report
+import profiling
+from profiling import phase
 
 # Optimisation hyperparamètres
 import optuna
@@ -22,11 +30,6 @@ import joblib
 from sklearn.model_selection import train_test_split
 from wordcloud import STOPWORDS
 
-# Charger les données (exemple)
-df = pd.read_csv("articles_scraped.csv")
-df = df.dropna(subset=['contenu'])
-print(f"📊 {len(df)} articles avec contenu chargés")
-
 # Initialisation de NLTK
 # Télécharger les stopwords français de NLTK si nécessaire
 try:
@@ -65,84 +68,172 @@ def preprocess(text):
     tokens = [word for word in tokens if word not in custom_stopwords and len(word) > 2]
     return ' '.join(tokens)
 
-print("🔄 Prétraitement des textes...")
-df['cleaned_content'] = df['contenu'].apply(preprocess)
-
-# Filtrer les textes vides après prétraitement
-df = df[df['cleaned_content'].str.len() > 10]
-print(f"📝 {len(df)} articles après prétraitement")
+# Passes en ligne depuis la solution du balayage, identiques pour les essais et le modèle final
+WARM_PASSES = 5
 
-# Vectorisation avec CountVectorizer
-# Créer un vecteur de type Bag of Words
-print("🔤 Vectorisation...")
-vectorizer = CountVectorizer(max_df=0.95, min_df=2) 
-X = vectorizer.fit_transform(df['cleaned_content'])
+# Version du prétraitement : à incrémenter si preprocess() change
+PREPROCESS_VERSION = 1
 
-print(f"📊 Matrice: {X.shape[0]} documents, {X.shape[1]} mots")
+# Empreinte du prétraitement, invalide le cache de corpus si les stopwords changent
+corpus_signature = hashlib.sha1(
+    f"{PREPROCESS_VERSION}|{'|'.join(sorted(custom_stopwords))}".encode('utf-8')
+).hexdigest()
 
-X_train, X_val = train_test_split(X, test_size=0.2, random_state=42)
 
-def objective(trial):
-    n_components = trial.suggest_int('n_components', 3, 15)
+def objective(trial, X_train, X_val, Xb, n_components, init_components):
+    # Le nombre de topics est fixé par le balayage, seul l'apprentissage est optimisé
     learning_decay = trial.suggest_float('learning_decay', 0.5, 0.9)
     learning_offset = trial.suggest_int('learning_offset', 10, 100)
 
-    lda = LatentDirichletAllocation(
-        n_components=n_components,
-        learning_method='online',
-        learning_decay=learning_decay,
-        learning_offset=learning_offset,
-        max_iter=10,
-        random_state=42
-    )
+    lda = make_lda(n_components, X_train.shape[0], learning_decay, learning_offset)
     
     try:
-        lda.fit(X_train)
-        # On évalue la perplexité sur validation
-        perplexity = lda.perplexity(X_val)
+        with phase(f"optuna_trial_{trial.number}"):
+            # Démarrage à chaud depuis la solution du balayage
+            warm_start(lda, X_train, init_components, WARM_PASSES)
+            # On évalue la perplexité sur validation
+            perplexity = lda.perplexity(X_val)
+            # Cohérence conservée pour information (l'objectif reste la perplexité)
+            npmi, umass = topic_coherence(Xb, lda.components_)
+            trial.set_user_attr('coherence_npmi', float(npmi.mean()))
+            trial.set_user_attr('coherence_umass', float(umass.mean()))
         return perplexity  # objectif : minimiser la perplexité
     except Exception as e:
         print(f"⚠️ Erreur dans un trial: {e}")
         return float('inf')  # Retourner une valeur très élevée en cas d'erreur
 
-print("🎯 Optimisation des hyperparamètres...")
-study = optuna.create_study(direction='minimize')
-study.optimize(objective, n_trials=30)
 
-print("Meilleurs paramètres : ", study.best_params)
-print("Meilleure perplexité :", study.best_value)
+def main():
+    # Paramètres depuis les arguments (utilisés par le workflow hebdomadaire)
+    n_trials = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    force_retrain = sys.argv[2].lower() == 'true' if len(sys.argv) > 2 else False
 
-best_params = study.best_params
+    # Le balayage repose sur des méthodes privées de scikit-learn: vérifier avant tout calcul
+    try:
+        check_sklearn_internals()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    # Charger les données
+    with phase('load'):
+        df = pd.read_csv("articles_scraped.csv")
+        df = df.dropna(subset=['contenu'])
+    print(f"📊 {len(df)} articles avec contenu chargés")
+
+    if len(df) < 50 and not force_retrain:
+        print(f"⚠️ Données insuffisantes ({len(df)} < 50)")
+        sys.exit(1)
+
+    # Prétraitement + vectorisation Bag of Words (seuls les nouveaux articles sont traités)
+    print("🔤 Prétraitement et vectorisation...")
+    df, X, vectorizer = build_document_term_matrix(df, preprocess, corpus_signature, min_df=2, max_df=0.95)
+    print(f"📝 {len(df)} articles après prétraitement")
+    print(f"📊 Matrice: {X.shape[0]} documents, {X.shape[1]} mots")
+
+    if len(df) < 20:
+        print("❌ Trop peu d'articles après prétraitement")
+        sys.exit(1)
+
+    X_train, X_val = train_test_split(X, test_size=0.2, random_state=42)
+
+    # Matrice binaire du corpus, partagée par tous les calculs de cohérence
+    Xb = binarize(X)
+
+    # Choix du nombre de topics: balayage 3..15 à démarrage à chaud
+    print("🧭 Sélection du nombre de topics...")
+    # En profilage, le balayage tourne dans le processus principal pour que ses
+    # ajustements apparaissent dans cProfile, les piles et le pic mémoire
+    sweep_jobs = -1
+    if profiling.is_active():
+        sweep_jobs = 1
+        profiling.note("n_components_sweep exécuté avec n_jobs=1 : durée supérieure à celle d'un run parallèle")
+    with phase('n_components_sweep'):
+        best_candidate, candidates = sweep_n_components(X_train, X_val, Xb, range(3, 16), n_jobs=sweep_jobs)
+    for c in candidates:
+        print(f"   • {c['n_components']} topics: perplexité {c['perplexity']:.1f}, "
+              f"NPMI {c['npmi']:.3f}, UMass {c['umass']:.3f} ({c['refine_passes']} itér., {c['fit_seconds']:.1f}s)")
+    n_components = best_candidate['n_components']
+    print(f"✅ Nombre de topics retenu: {n_components}")
+
+    print(f"🎯 Optimisation des hyperparamètres ({n_trials} essais)...")
+    study = optuna.create_study(direction='minimize')
+    study.optimize(
+        lambda trial: objective(trial, X_train, X_val, Xb, n_components, best_candidate['components']),
+        n_trials=n_trials
+    )
 
-print("🏋️ Entraînement final du modèle...")
-best_lda = LatentDirichletAllocation(
-    n_components=best_params['n_components'],
-    learning_method='online',
-    learning_decay=best_params['learning_decay'],
-    learning_offset=best_params['learning_offset'],
-    max_iter=20,   # ou plus, pour un entraînement complet
-    random_state=42
-)
+    best_params = {'n_components': n_components, **study.best_params}
+    print("Meilleurs paramètres : ", best_params)
+    print("Meilleure perplexité :", study.best_value)
 
-best_lda.fit(X) 
+    # Même entraînement que les essais (démarrage à chaud depuis le balayage), sur tout le corpus
+    print("🏋️ Entraînement final du modèle...")
+    best_lda = make_lda(best_params['n_components'], X.shape[0],
+                        best_params['learning_decay'], best_params['learning_offset'])
 
-# Créer le dossier models s'il n'existe pas
-os.makedirs('./models', exist_ok=True)
+    with phase('final_fit'):
+        warm_start(best_lda, X, best_candidate['components'], WARM_PASSES)
 
-# Sauvegarder le modèle
-print("💾 Sauvegarde du modèle...")
-joblib.dump(best_lda, './models/best_lda_model.joblib')
+    # Qualité des topics: cohérence NPMI/UMass et mots principaux
+    with phase('topic_quality'):
+        quality = topic_quality_report(best_lda, Xb, vectorizer.get_feature_names_out())
+    print(f"🧪 Cohérence NPMI {quality['coherence_npmi']:.3f}, UMass {quality['coherence_umass']:.3f} "
+          f"({quality['seconds']:.2f}s)")
+    for topic in quality['topics']:
+        print(f"   • Topic {topic['topic']} (NPMI {topic['npmi']:.3f}): {', '.join(topic['top_words'])}")
 
-# Sauvegarder aussi le vectorizer pour pouvoir l'utiliser plus tard
-joblib.dump(vectorizer, './models/vectorizer.joblib')
+    # Créer le dossier models s'il n'existe pas
+    os.makedirs('./models', exist_ok=True)
 
-print("✅ Modèle sauvegardé avec succès!")
+    # Sauvegarder le modèle
+    print("💾 Sauvegarde du modèle...")
+    with phase('save'):
+        joblib.dump(best_lda, './models/best_lda_model.joblib')
 
-# Test de chargement
-print("🔍 Test de chargement...")
-try:
-    best_lda_loaded = joblib.load('./models/best_lda_model.joblib')
-    vectorizer_loaded = joblib.load('./models/vectorizer.joblib')
-    print("✅ Test de chargement réussi!")
-except Exception as e:
-    print(f"❌ Erreur lors du test de chargement: {e}")
\ No newline at end of file
+        # Sauvegarder aussi le vectorizer pour pouvoir l'utiliser plus tard
+        joblib.dump(vectorizer, './models/vectorizer.joblib')
+
+    print("✅ Modèle sauvegardé avec succès!")
+
+    # Test de chargement
+    print("🔍 Test de chargement...")
+    try:
+        best_lda_loaded = joblib.load('./models/best_lda_model.joblib')
+        vectorizer_loaded = joblib.load('./models/vectorizer.joblib')
+        print("✅ Test de chargement réussi!")
+    except Exception as e:
+        print(f"❌ Erreur lors du test de chargement: {e}")
+        sys.exit(1)
+
+    # Métadonnées
+    metadata = {
+        'timestamp': datetime.now().isoformat(),
+        'n_documents': len(df),
+        'n_features': X.shape[1],
+        'best_params': best_params,
+        'best_perplexity': study.best_value,
+        'n_trials': n_trials,
+        'n_components_sweep': [
+            {k: v for k, v in c.items() if k != 'components'} for c in candidates
+        ],
+        'best_trial_coherence': study.best_trial.user_attrs,
+        'topic_quality': quality
+    }
+    with open('./models/model_metadata.json', 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2, ensure_ascii=False)
+
+    # Ligne lue par le workflow GitHub Actions
+    print(f"SUCCESS:{best_params['n_components']}:{study.best_value:.2f}:{len(df)}")
+
+
+if __name__ == "__main__":
+    # python lda.py [n_trials] [force_retrain] [--profile]
+    profile = profiling.profiling_requested()
+    if profile:
+        profiling.start('lda')
+    try:
+        main()
+    finally:
+        if profile:
+            profiling.stop()
@@ -0,0 +1,175 @@
+# Sélection du nombre de topics par balayage LDA à démarrage à chaud
+#
+# Les valeurs de n_components sont parcourues en une seule chaîne croissante :
+# seul le premier modèle est initialisé à froid, chacun des suivants repart de
+# la solution précédente en scindant son topic le plus lourd. Tous les candidats
+# sont donc obtenus de la même manière et affinés jusqu'au même critère de
+# convergence avant d'être notés. n_jobs parallélise l'étape E de chaque
+# itération (sans effet sur le résultat), et tous les candidats sont notés avec
+# une seule matrice de co-occurrences.
+
+import inspect
+import time
+
+import numpy as np
+import sklearn
+from joblib import effective_n_jobs
+from scipy.special import psi
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.utils.parallel import Parallel
+
+from topic_quality import CooccurrenceIndex, top_word_indices
+
+# Méthodes et attributs privés de LatentDirichletAllocation utilisés par ce module,
+# vérifiés avec les versions de scikit-learn autorisées par requirements.txt
+SKLEARN_PRIVATE_METHODS = {
+    '_init_latent_vars': ['n_features'],
+    '_e_step': ['X', 'cal_sstats', 'random_init', 'parallel'],
+    '_perplexity_precomp_distr': ['X', 'doc_topic_distr', 'sub_sampling'],
+}
+SKLEARN_PRIVATE_ATTRIBUTES = ['topic_word_prior_', 'doc_topic_prior_', 'random_state_', 'n_batch_iter_']
+
+# Paramètres d'apprentissage du balayage (milieu des plages explorées par Optuna)
+SWEEP_LEARNING_DECAY = 0.7
+SWEEP_LEARNING_OFFSET = 55
+
+
+def check_sklearn_internals():
+    """Échoue avec un message explicite si scikit-learn n'expose plus l'API privée utilisée ici"""
+    problems = []
+    for name, params in SKLEARN_PRIVATE_METHODS.items():
+        method = getattr(LatentDirichletAllocation, name, None)
+        if method is None:
+            problems.append(f"{name} absente")
+            continue
+        signature = inspect.signature(method).parameters
+        problems.extend(f"{name} sans paramètre {p}" for p in params if p not in signature)
+
+    if not problems:
+        lda = LatentDirichletAllocation(n_components=2)
+        lda._init_latent_vars(3)
+        problems.extend(f"attribut {a} absent" for a in SKLEARN_PRIVATE_ATTRIBUTES if not hasattr(lda, a))
+
+    if problems:
+        raise RuntimeError(
+            f"scikit-learn {sklearn.__version__} incompatible avec lda_selection.py "
+            f"({'; '.join(problems)}) - installer la version indiquée dans requirements.txt"
+        )
+
+
+def make_lda(n_components, n_samples, learning_decay=SWEEP_LEARNING_DECAY,
+             learning_offset=SWEEP_LEARNING_OFFSET, max_iter=10, n_jobs=None):
+    return LatentDirichletAllocation(
+        n_components=n_components,
+        learning_method='online',
+        learning_decay=learning_decay,
+        learning_offset=learning_offset,
+        max_iter=max_iter,
+        total_samples=n_samples,
+        n_jobs=n_jobs,
+        random_state=42
+    )
+
+
+def set_components(lda, components):
+    """Remplace les paramètres topic-mot de ``lda`` par ``components``"""
+    lda.components_ = components.astype(np.float64, copy=True)
+    lda.exp_dirichlet_component_ = np.exp(
+        psi(lda.components_) - psi(lda.components_.sum(axis=1))[:, np.newaxis]
+    )
+
+
+def warm_start(lda, X, components, n_passes=5):
+    """Entraîne ``lda`` sur ``X`` en partant de ``components`` plutôt que d'une initialisation aléatoire"""
+    lda._init_latent_vars(components.shape[1])
+    set_components(lda, components)
+    lda.n_features_in_ = components.shape[1]
+    for _ in range(n_passes):
+        lda.partial_fit(X)
+    return lda
+
+
+def refine(lda, X, components, tol=1e-3, max_passes=50, parallel=None):
+    """Affine ``lda`` depuis ``components`` par EM variationnel en batch jusqu'à convergence.
+
+    Contrairement aux passes en ligne, dont le pas décroît, chaque itération en
+    batch améliore la borne : l'arrêt sur variation relative de la perplexité
+    sur ``X`` (< ``tol``) donne le même niveau de convergence à tous les
+    candidats. L'étape E part d'une initialisation fixe, si bien que le
+    résultat ne dépend pas du découpage entre processus. Retourne le nombre
+    d'itérations effectuées.
+    """
+    X = X.astype(np.float64)  # l'étape E attend des flottants
+    warm_start(lda, X, components, n_passes=0)
+    previous = None
+    for n_passes in range(1, max_passes + 1):
+        # Une seule étape E donne la perplexité du modèle courant et les statistiques de l'étape M
+        doc_topic, suff_stats = lda._e_step(X, cal_sstats=True, random_init=False, parallel=parallel)
+        current = lda._perplexity_precomp_distr(X, doc_topic, sub_sampling=False)
+        if previous is not None and previous - current <= tol * previous:
+            return n_passes - 1
+        previous = current
+        set_components(lda, lda.topic_word_prior_ + suff_stats)
+    return max_passes
+
+
+def split_heaviest_topic(components, rng):
+    """Ajoute un topic en scindant le plus lourd en deux moitiés légèrement perturbées"""
+    i = np.argmax(components.sum(axis=1))
+    noise = rng.uniform(0.9, 1.1, size=components.shape[1])
+    first = components[i] * noise / 2
+    second = components[i] * (2 - noise) / 2
+    return np.vstack([np.delete(components, i, axis=0), first, second])
+
+
+def sweep_n_components(X_train, X_val, Xb, values=range(3, 16), n_jobs=-1, top_n=10,
+                       cold_iter=10, tol=1e-3, max_passes=50):
+    """Évalue chaque nombre de topics (perplexité + cohérence) et choisit le meilleur.
+
+    ``Xb`` est la matrice binaire du corpus complet (``topic_quality.binarize``).
+    Le nombre retenu minimise le rang moyen entre perplexité (croissante) et
+    cohérence NPMI (décroissante) ; en cas d'égalité, la perplexité départage.
+    Le résultat ne dépend pas de ``n_jobs``.
+    """
+    values = sorted(int(v) for v in values)
+    n_jobs = effective_n_jobs(n_jobs)
+    rng = np.random.RandomState(42)
+    candidates = []
+    components = None
+
+    with Parallel(n_jobs=n_jobs, max_nbytes='1M') as parallel:
+        for n_components in values:
+            start = time.perf_counter()
+            if components is None:
+                # Initialisation à froid du premier modèle de la chaîne (séquentielle:
+                # l'initialisation aléatoire de l'étape E dépend du découpage entre processus)
+                cold = make_lda(n_components, X_train.shape[0], max_iter=cold_iter)
+                components = cold.fit(X_train).components_
+            else:
+                while components.shape[0] < n_components:
+                    components = split_heaviest_topic(components, rng)
+            lda = make_lda(n_components, X_train.shape[0], n_jobs=n_jobs)
+            n_passes = refine(lda, X_train, components, tol=tol, max_passes=max_passes, parallel=parallel)
+            components = lda.components_
+            candidates.append({
+                'n_components': n_components,
+                'perplexity': float(lda.perplexity(X_val)),
+                'fit_seconds': round(time.perf_counter() - start, 3),
+                'warm_start': len(candidates) > 0,
+                'refine_passes': n_passes,
+                'components': components,
+            })
+
+    # Une seule matrice de co-occurrences pour tous les candidats
+    top_words = [top_word_indices(r['components'], top_n) for r in candidates]
+    index = CooccurrenceIndex(Xb, np.concatenate([t.ravel() for t in top_words]))
+    for r, top in zip(candidates, top_words):
+        r['npmi'] = float(index.npmi(top).mean())
+        r['umass'] = float(index.umass(top).mean())
+
+    perplexity_rank = np.argsort(np.argsort([r['perplexity'] for r in candidates]))
+    npmi_rank = np.argsort(np.argsort([-r['npmi'] for r in candidates]))
+    best = min(range(len(candidates)),
+               key=lambda i: (perplexity_rank[i] + npmi_rank[i], candidates[i]['perplexity']))
+
+    return candidates[best], candidates
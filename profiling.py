@@ -0,0 +1,229 @@
+# Mode profilage optionnel pour scraper.py et lda.py
+#
+# Activé par l'option --profile (ou la variable d'environnement SENE_PROFILE=1).
+# Pendant l'exécution on collecte :
+# - le temps et le pic mémoire (tracemalloc) de chaque phase
+# - un profil cProfile du processus principal
+# - un échantillonnage des piles du thread principal (format "folded" lisible
+#   par flamegraph.pl / speedscope)
+# Les rapports sont écrits dans models/ et comparés au rapport précédent pour
+# signaler les phases qui ont ralenti.
+#
+# Seul le processus principal est mesuré : le code appelant doit exécuter en
+# processus unique les calculs qu'il veut voir dans le rapport (voir
+# is_active()) et y consigner les écarts avec un run normal (note()).
+#
+# Sans profilage actif, phase() ne fait rien.
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+REPORT_DIR = './models'
+
+_active = None
+
+
+class StackSampler(threading.Thread):
+    """Échantillonne périodiquement la pile du thread principal"""
+
+    def __init__(self, interval=0.005):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.target_id = threading.main_thread().ident
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class RunProfiler:
+    def __init__(self, name, report_dir=REPORT_DIR, sample_interval=0.005,
+                 regression_ratio=1.5, min_regression_seconds=1.0):
+        self.name = name
+        self.report_dir = report_dir
+        self.report_file = os.path.join(report_dir, f"profile_{name}.json")
+        self.stacks_file = os.path.join(report_dir, f"profile_{name}.folded")
+        self.pstats_file = os.path.join(report_dir, f"profile_{name}.pstats")
+        self.regression_ratio = regression_ratio
+        self.min_regression_seconds = min_regression_seconds
+
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(sample_interval)
+        self.phases = []
+        self.notes = ['cProfile, piles et tracemalloc ne couvrent que le processus principal']
+        self._stack = []
+        self._peak = 0
+
+    def start(self):
+        print(f"⏱️ Profilage activé ({self.name})")
+        self._start_time = time.perf_counter()
+        tracemalloc.start()
+        self.sampler.start()
+        self.profile.enable()
+
+    def _record_peak(self):
+        """Répercute le pic mémoire courant sur les phases ouvertes puis le réinitialise"""
+        peak = tracemalloc.get_traced_memory()[1]
+        for entry in self._stack:
+            entry['peak'] = max(entry['peak'], peak)
+        self._peak = max(self._peak, peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def phase(self, name):
+        self._record_peak()
+        entry = {'name': name, 'peak': 0}
+        self._stack.append(entry)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._record_peak()
+            self._stack.pop()
+            self.phases.append({
+                'name': name,
+                'seconds': round(seconds, 3),
+                'peak_memory_mb': round(entry['peak'] / 1024 ** 2, 2),
+            })
+
+    def load_previous(self):
+        if not os.path.exists(self.report_file):
+            return None
+        try:
+            with open(self.report_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Rapport de profilage précédent illisible: {e}")
+            return None
+
+    def find_regressions(self, report, previous):
+        """Phases nettement plus lentes que lors du run précédent"""
+        if not previous:
+            return []
+        previous_phases = {p['name']: p['seconds'] for p in previous.get('phases', [])}
+        previous_phases['total'] = previous.get('total_seconds', 0)
+        current = [(p['name'], p['seconds']) for p in report['phases']]
+        current.append(('total', report['total_seconds']))
+
+        regressions = []
+        for name, seconds in current:
+            before = previous_phases.get(name)
+            if not before:
+                continue
+            if seconds > before * self.regression_ratio and seconds - before >= self.min_regression_seconds:
+                regressions.append({
+                    'name': name,
+                    'seconds': seconds,
+                    'previous_seconds': before,
+                    'ratio': round(seconds / before, 2),
+                })
+        return regressions
+
+    def stop(self):
+        self.profile.disable()
+        self.sampler.stop()
+        self._record_peak()
+        tracemalloc.stop()
+        total_seconds = time.perf_counter() - self._start_time
+
+        stats_output = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=stats_output)
+        stats.sort_stats('cumulative').print_stats(30)
+
+        report = {
+            'name': self.name,
+            'timestamp': datetime.now().isoformat(),
+            'total_seconds': round(total_seconds, 3),
+            'peak_memory_mb': round(self._peak / 1024 ** 2, 2),
+            'phases': self.phases,
+            'notes': self.notes,
+            'samples': sum(self.sampler.stacks.values()),
+            'top_functions': stats_output.getvalue().splitlines(),
+        }
+        previous = self.load_previous()
+        report['previous_timestamp'] = previous.get('timestamp') if previous else None
+        report['regressions'] = self.find_regressions(report, previous)
+
+        os.makedirs(self.report_dir, exist_ok=True)
+        with open(self.report_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        with open(self.stacks_file, 'w', encoding='utf-8') as f:
+            for stack, count in self.sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self.profile.dump_stats(self.pstats_file)
+
+        print(f"\n⏱️ PROFILAGE ({self.name}): {report['total_seconds']:.1f}s, pic mémoire {report['peak_memory_mb']:.1f} Mo")
+        for p in self.phases:
+            print(f"   • {p['name']}: {p['seconds']:.2f}s, {p['peak_memory_mb']:.1f} Mo")
+        for n in self.notes:
+            print(f"   ℹ️ {n}")
+        for r in report['regressions']:
+            print(f"⚠️ Régression {r['name']}: {r['previous_seconds']:.2f}s → {r['seconds']:.2f}s (x{r['ratio']})")
+        print(f"📄 Rapport: {self.report_file} | Piles (flamegraph): {self.stacks_file}")
+        return report
+
+
+def profiling_requested(argv=None):
+    """Retire --profile de argv et indique si le profilage est demandé"""
+    argv = sys.argv if argv is None else argv
+    requested = '--profile' in argv
+    while '--profile' in argv:
+        argv.remove('--profile')
+    return requested or os.environ.get('SENE_PROFILE') == '1'
+
+
+def start(name, report_dir=REPORT_DIR):
+    """Démarre le profilage global du processus"""
+    global _active
+    _active = RunProfiler(name, report_dir)
+    _active.start()
+    return _active
+
+
+def stop():
+    global _active
+    if _active is None:
+        return None
+    profiler, _active = _active, None
+    return profiler.stop()
+
+
+def is_active():
+    return _active is not None
+
+
+def note(text):
+    """Ajoute une remarque au rapport de profilage (sans effet si le profilage est inactif)"""
+    if _active is not None:
+        _active.notes.append(text)
+
+
+def phase(name):
+    """Mesure une phase si le profilage est actif, sinon ne fait rien"""
+    if _active is None:
+        return nullcontext()
+    return _active.phase(name)
@@ -11,9 +11,148 @@ from urllib.parse import urljoin, urlparse
 import time
 import sys
 import os
+import json
+
+import profiling
+from profiling import phase
+
+
+class CrawlCheckpoint:
+    """Journal local permettant de reprendre un crawl interrompu.
+
+    Deux fichiers sont tenus dans ``directory`` :
+    - ``articles.jsonl`` : articles collectés, ajoutés au fil de l'eau (flush + fsync)
+    - ``frontier.json`` : fenêtre de dates, pages de listing terminées,
+      sections terminées et articles déjà examinés mais non retenus
+    """
+
+    def __init__(self, directory, run_key, max_age_hours=12):
+        self.directory = directory
+        self.journal_file = os.path.join(directory, 'articles.jsonl')
+        self.state_file = os.path.join(directory, 'frontier.json')
+        self.run_key = run_key
+        self.max_age_hours = max_age_hours
+        # Fenêtre d'un run inachevé dont la frontière n'a pas pu être reprise
+        self.previous_window = None
+        os.makedirs(directory, exist_ok=True)
+        self.state = self._load_state()
+        self.resumed = self.state is not None
+        if not self.resumed:
+            self.state = self._new_state()
+
+    def _new_state(self):
+        return {
+            'run_key': self.run_key,
+            'created_at': datetime.now().isoformat(),
+            'start_date': None,
+            'end_date': None,
+            'listings': {},
+            'sections_done': [],
+            'visited': {},
+        }
+
+    def _load_state(self):
+        """Charge la frontière si elle correspond au même run et n'est pas périmée"""
+        if not os.path.exists(self.state_file):
+            return None
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            created_at = datetime.fromisoformat(state['created_at'])
+        except Exception as e:
+            print(f"⚠️ Checkpoint illisible, ignoré: {e}")
+            return None
+
+        if state.get('run_key') != self.run_key:
+            print("ℹ️ Checkpoint d'un autre run ignoré (articles du journal conservés)")
+            self._remember_window(state)
+            return None
+        if self.max_age_hours is not None and datetime.now() - created_at > timedelta(hours=self.max_age_hours):
+            print("ℹ️ Checkpoint périmé ignoré (articles du journal conservés)")
+            self._remember_window(state)
+            return None
+        return state
+
+    def _remember_window(self, state):
+        try:
+            self.previous_window = (datetime.fromisoformat(state['start_date']),
+                                    datetime.fromisoformat(state['end_date']))
+        except (KeyError, TypeError, ValueError):
+            self.previous_window = None
+
+    def save(self):
+        """Écrit la frontière de manière atomique"""
+        tmp_file = self.state_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp_file, self.state_file)
+
+    def set_window(self, start_date, end_date):
+        self.state['start_date'] = start_date.isoformat()
+        self.state['end_date'] = end_date.isoformat()
+        self.save()
+
+    def get_window(self):
+        return (datetime.fromisoformat(self.state['start_date']),
+                datetime.fromisoformat(self.state['end_date']))
+
+    def get_listing(self, listing_url):
+        return self.state['listings'].get(listing_url)
+
+    def finish_listing(self, listing_url, stop=False):
+        self.state['listings'][listing_url] = {'stop': stop}
+        self.save()
+
+    def is_section_done(self, section):
+        return section in self.state['sections_done']
+
+    def finish_section(self, section):
+        if section not in self.state['sections_done']:
+            self.state['sections_done'].append(section)
+        self.save()
+
+    def visited_status(self, article_url):
+        return self.state['visited'].get(article_url)
+
+    def mark_visited(self, article_url, status):
+        self.state['visited'][article_url] = status
+
+    def append_records(self, records):
+        """Ajoute des articles au journal et force l'écriture sur disque"""
+        if not records:
+            return
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def iter_records(self):
+        """Parcourt les articles du journal (une ligne tronquée par un arrêt brutal est ignorée)"""
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def clear_records(self):
+        """Vide le journal une fois ses articles fusionnés (la frontière est conservée)"""
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+
+    def clear(self):
+        """Supprime journal et frontière une fois les données fusionnées"""
+        for path in (self.journal_file, self.state_file):
+            if os.path.exists(path):
+                os.remove(path)
+
 
 class UnifiedNewsScraper:
-    def __init__(self, main_csv_file='articles_scraped.csv'):
+    def __init__(self, main_csv_file='articles_scraped.csv',
+                 checkpoint_dir='.cache/scraper_checkpoint', flush_every=20):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -22,11 +161,21 @@ class UnifiedNewsScraper:
         self.main_csv_file = main_csv_file
         self.existing_urls = set()
         
+        # Checkpoint de reprise (désactivé si checkpoint_dir=None)
+        self.checkpoint_dir = checkpoint_dir
+        self.flush_every = flush_every
+        self.checkpoint = None
+        # Sections interrompues par une page de listing inaccessible
+        self.incomplete_sections = set()
+        
         # Charger les URLs existantes pour éviter les doublons
-        self.load_existing_urls()
+        with phase('load_existing_urls'):
+            self.load_existing_urls()
     
     def load_existing_urls(self):
         """Charge les URLs existantes pour éviter les doublons"""
+        if self.main_csv_file is None:
+            return
         if os.path.exists(self.main_csv_file):
             try:
                 existing_df = pd.read_csv(self.main_csv_file)
@@ -44,6 +193,68 @@ class UnifiedNewsScraper:
         """Vérifie si l'URL existe déjà"""
         return url in self.existing_urls
     
+    def add_article(self, article_data):
+        """Ajoute un article collecté et vide le tampon dans le journal si nécessaire"""
+        self.all_articles.append(article_data)
+        self.existing_urls.add(article_data['url'])  # Ajouter à la liste des URLs existantes
+        if self.checkpoint and len(self.all_articles) >= self.flush_every:
+            self.flush_articles()
+    
+    def flush_articles(self):
+        """Écrit les articles en mémoire dans le journal et sauvegarde la frontière"""
+        if not self.checkpoint:
+            return
+        self.checkpoint.append_records(self.all_articles)
+        self.all_articles = []
+        self.checkpoint.save()
+    
+    def open_checkpoint(self, run_key, start_date, end_date, max_age_hours=12, extend_window=True):
+        """Ouvre le checkpoint du run et retourne la fenêtre de dates à utiliser.
+        
+        Si la frontière d'un run inachevé est périmée ou d'un autre run, elle ne
+        peut pas être reprise telle quelle ; avec ``extend_window`` la nouvelle
+        fenêtre remonte alors jusqu'au début de l'ancienne pour ne rien perdre.
+        """
+        self.checkpoint = CrawlCheckpoint(self.checkpoint_dir, run_key, max_age_hours)
+        journal_urls = {record['url'] for record in self.checkpoint.iter_records()}
+        self.existing_urls.update(journal_urls)
+        if self.checkpoint.resumed:
+            start_date, end_date = self.checkpoint.get_window()
+            print(f"♻️ Reprise du run interrompu: {len(journal_urls)} articles déjà collectés")
+        else:
+            previous = self.checkpoint.previous_window
+            if extend_window and previous and previous[0] < start_date:
+                start_date = previous[0]
+                print(f"♻️ Run précédent inachevé: fenêtre étendue au {start_date.strftime('%d/%m/%Y %H:%M')}")
+            self.checkpoint.set_window(start_date, end_date)
+            if journal_urls:
+                print(f"♻️ {len(journal_urls)} articles récupérés du journal précédent")
+        return start_date, end_date
+    
+    def finish_listing(self, listing_url, stop=False):
+        """Marque une page de listing comme terminée (après écriture des articles)"""
+        if self.checkpoint:
+            self.flush_articles()
+            self.checkpoint.finish_listing(listing_url, stop)
+    
+    def finish_section(self, section):
+        if self.checkpoint:
+            self.flush_articles()
+            self.checkpoint.finish_section(section)
+    
+    def is_section_done(self, section):
+        return bool(self.checkpoint) and self.checkpoint.is_section_done(section)
+    
+    def get_listing_checkpoint(self, listing_url):
+        return self.checkpoint.get_listing(listing_url) if self.checkpoint else None
+    
+    def visited_status(self, article_url):
+        return self.checkpoint.visited_status(article_url) if self.checkpoint else None
+    
+    def mark_visited(self, article_url, status):
+        if self.checkpoint:
+            self.checkpoint.mark_visited(article_url, status)
+    
     def harmonize_theme(self, original_theme):
         """Harmonise les thèmes selon les règles spécifiées"""
         if not original_theme or pd.isna(original_theme):
@@ -207,45 +418,98 @@ class UnifiedNewsScraper:
             print(f"❌ Erreur récupération {url}: {e}")
             return None
     
-    def scrape_senenews(self, start_date, end_date, max_pages=10):
-        """Scraper SeneNews"""
-        print("\n🔥 SCRAPING SENENEWS 🔥")
+    def senenews_page_url(self, page):
+        base_url = "https://www.senenews.com"
+        if page == 1:
+            return f"{base_url}/category/actualites"
+        return f"{base_url}/category/actualites/page/{page}"
+    
+    def extract_senenews_links(self, soup):
+        """Liens d'articles d'une page de listing SeneNews"""
         base_url = "https://www.senenews.com"
+        article_links = []
+        selectors = [
+            'h2 a[href*="senenews.com"]',
+            'h3 a[href*="senenews.com"]',
+            '.entry-title a',
+            'article a[href*="senenews.com"]',
+            'a[href*="/20"]'
+        ]
+        
+        for selector in selectors:
+            links = soup.select(selector)
+            for link in links:
+                href = link.get('href')
+                if href and 'senenews.com' in href:
+                    full_url = urljoin(base_url, href)
+                    if full_url not in article_links:
+                        article_links.append(full_url)
+        return article_links
+    
+    def senenews_page_date(self, page, n_samples=3):
+        """Date approximative d'une page de listing SeneNews (médiane de ses premiers articles).
+        
+        Une page sans article (au-delà de la fin du listing) vaut ``datetime.min`` ;
+        retourne None si la page ou ses articles ne peuvent pas être chargés.
+        """
+        soup = self.get_soup(self.senenews_page_url(page))
+        if not soup:
+            return None
+        article_links = self.extract_senenews_links(soup)
+        if not article_links:
+            return datetime.min
+        dates = []
+        for article_url in article_links[:n_samples]:
+            article_data = self.extract_senenews_article(article_url)
+            if article_data and article_data['date']:
+                article_date = self.parse_senenews_date(article_data['date'])
+                if article_date:
+                    dates.append(article_date)
+            time.sleep(0.5)
+        if not dates:
+            return None
+        return sorted(dates)[len(dates) // 2]
+    
+    def scrape_senenews(self, start_date, end_date, max_pages=10, first_page=1, last_page=None):
+        """Scraper SeneNews.
+        
+        Parcourt les pages ``first_page`` à ``last_page`` ; sans ``last_page``, le
+        parcours continue jusqu'aux articles trop anciens (au plus ``max_pages``).
+        """
+        print("\n🔥 SCRAPING SENENEWS 🔥")
         articles_found = 0
+        failed_pages = []
+        exhausted = False
         
-        for page in range(1, max_pages + 1):
+        if self.is_section_done('senenews'):
+            print("⏭️ SeneNews déjà terminé lors du run interrompu")
+            return 0
+        
+        for page in range(first_page, (last_page or max_pages) + 1):
             print(f"\n📄 SeneNews - Page {page}")
             
-            if page == 1:
-                page_url = f"{base_url}/category/actualites"
-            else:
-                page_url = f"{base_url}/category/actualites/page/{page}"
+            page_url = self.senenews_page_url(page)
+            
+            # Reprise: page déjà traitée lors du run interrompu
+            listing = self.get_listing_checkpoint(page_url)
+            if listing is not None:
+                print("⏭️ Page déjà traitée (reprise)")
+                if listing['stop']:
+                    break
+                continue
             
             soup = self.get_soup(page_url)
             if not soup:
+                # Page non marquée comme traitée: elle sera retentée à la reprise
+                failed_pages.append(page)
                 continue
             
             # Récupérer les liens d'articles
-            article_links = []
-            selectors = [
-                'h2 a[href*="senenews.com"]',
-                'h3 a[href*="senenews.com"]',
-                '.entry-title a',
-                'article a[href*="senenews.com"]',
-                'a[href*="/20"]'
-            ]
-            
-            for selector in selectors:
-                links = soup.select(selector)
-                for link in links:
-                    href = link.get('href')
-                    if href and 'senenews.com' in href:
-                        full_url = urljoin(base_url, href)
-                        if full_url not in article_links:
-                            article_links.append(full_url)
+            article_links = self.extract_senenews_links(soup)
             
             if not article_links:
                 print(f"❌ Aucun article trouvé sur la page {page}")
+                self.finish_listing(page_url, stop=True)
                 break
             
             print(f"🔍 {len(article_links)} articles trouvés")
@@ -260,6 +524,13 @@ class UnifiedNewsScraper:
                     articles_skipped_duplicate += 1
                     continue
                 
+                # Article déjà examiné lors du run interrompu
+                status = self.visited_status(article_url)
+                if status:
+                    if status == 'too_old':
+                        articles_too_old += 1
+                    continue
+                
                 article_data = self.extract_senenews_article(article_url)
                 
                 if article_data and article_data['date']:
@@ -270,24 +541,44 @@ class UnifiedNewsScraper:
                             article_data['source'] = 'SeneNews'
                             article_data['theme_original'] = article_data.get('rubrique', 'Actualités')
                             article_data['date_parsed'] = article_date.strftime('%Y-%m-%d %H:%M')
-                            self.all_articles.append(article_data)
-                            self.existing_urls.add(article_url)  # Ajouter à la liste des URLs existantes
+                            self.add_article(article_data)
                             page_articles_in_range += 1
                             articles_found += 1
                             print(f"✅ Nouvel article ajouté: {article_data['titre'][:50]}...")
                         elif article_date < start_date:
                             articles_too_old += 1
+                            self.mark_visited(article_url, 'too_old')
+                        else:
+                            self.mark_visited(article_url, 'too_recent')
+                    else:
+                        self.mark_visited(article_url, 'no_date')
                 
                 time.sleep(1)
             
             print(f"📊 Page {page}: {page_articles_in_range} nouveaux, {articles_skipped_duplicate} doublons, {articles_too_old} trop anciens")
             
-            if articles_too_old > page_articles_in_range and page_articles_in_range == 0:
+            stop = articles_too_old > page_articles_in_range and page_articles_in_range == 0
+            self.finish_listing(page_url, stop=stop)
+            if stop:
                 print("🛑 Articles trop anciens, arrêt du scraping SeneNews")
                 break
             
             time.sleep(2)
+        else:
+            # max_pages atteint sans remonter jusqu'à start_date (une plage
+            # de pages bornée par last_page est, elle, complète)
+            exhausted = last_page is None
         
+        if failed_pages or exhausted:
+            # Section non terminée: les pages en échec seront reprises au prochain lancement
+            self.incomplete_sections.add('senenews')
+            self.flush_articles()
+            if failed_pages:
+                print(f"⚠️ SeneNews incomplet: {len(failed_pages)} pages inaccessibles ({failed_pages})")
+            if exhausted:
+                print(f"⚠️ SeneNews incomplet: {max_pages} pages parcourues sans atteindre le {start_date.strftime('%d/%m/%Y')}")
+        else:
+            self.finish_section('senenews')
         print(f"✅ SeneNews terminé: {articles_found} nouveaux articles récupérés")
         return articles_found
     
@@ -355,17 +646,13 @@ class UnifiedNewsScraper:
             print(f"❌ Erreur extraction SeneNews {article_url}: {e}")
             return None
     
-    def scrape_senego(self, start_date, end_date, max_pages=10):
-        """Scraper Senego"""
-        print("\n🌟 SCRAPING SENEGO 🌟")
+    def get_senego_themes(self):
+        """Récupère les rubriques Senego depuis le menu de navigation"""
         base_url = "https://senego.com"
-        articles_found = 0
-        
-        # Récupérer les thèmes
         try:
             soup = self.get_soup(base_url)
             if not soup:
-                return 0
+                return None
             
             menu_items = soup.select("header nav.nav .top-menu-content-wrapper .menuItemWrapper a.navItem")
             navigation = [{'theme': a.text.strip(), 'url': base_url + a['href'] if a['href'].startswith('/') else a['href']}
@@ -375,106 +662,149 @@ class UnifiedNewsScraper:
             if themes_dict:
                 first_key = next(iter(themes_dict))
                 themes_dict.pop(first_key)
+            
+            return themes_dict
                 
         except Exception as e:
             print(f"❌ Erreur récupération menu Senego: {e}")
+            return None
+    
+    def scrape_senego(self, start_date, end_date, max_pages=10):
+        """Scraper Senego"""
+        print("\n🌟 SCRAPING SENEGO 🌟")
+        articles_found = 0
+        
+        # Récupérer les thèmes
+        themes_dict = self.get_senego_themes()
+        if themes_dict is None:
             return 0
         
         # Scraper chaque thème
         for theme, base_link in themes_dict.items():
-            print(f"\n📚 Senego - Thème: {theme}")
-            theme_articles_found = 0
-            should_continue_theme = True
-            
-            for page_num in range(1, max_pages + 1):
-                if not should_continue_theme:
-                    break
-                    
-                url = f"{base_link}/page/{page_num}" if page_num > 1 else base_link
-                print(f"📄 Page {page_num}")
-                
-                soup = self.get_soup(url)
-                if not soup:
-                    break
-                
-                articles = soup.select("section.sectionWithSidebar section.postsSectionCenter article")
-                if not articles:
-                    break
-                
-                page_articles_in_range = 0
-                page_articles_too_old = 0
-                articles_skipped_duplicate = 0
+            articles_found += self.scrape_senego_theme(theme, base_link, start_date, end_date, max_pages)
+        
+        print(f"✅ Senego terminé: {articles_found} nouveaux articles récupérés")
+        return articles_found
+    
+    def scrape_senego_theme(self, theme, base_link, start_date, end_date, max_pages=10):
+        """Scraper une rubrique Senego"""
+        print(f"\n📚 Senego - Thème: {theme}")
+        theme_articles_found = 0
+        should_continue_theme = True
+        section = f"senego:{theme}"
+        
+        if self.is_section_done(section):
+            print("⏭️ Thème déjà terminé lors du run interrompu")
+            return 0
+        
+        for page_num in range(1, max_pages + 1):
+            if not should_continue_theme:
+                break
                 
-                for article in articles:
-                    try:
-                        title_tag = article.select_one("h2.archive-post-title a")
-                        if not title_tag:
-                            continue
-                            
-                        titre = title_tag.get_text(strip=True)
-                        article_url = title_tag['href']
-                        
-                        # Vérifier si l'article existe déjà
-                        if self.is_duplicate_url(article_url):
-                            articles_skipped_duplicate += 1
-                            continue
-                        
-                        auteur_elem = article.select_one("span.archive-post-author")
-                        date_elem = article.select_one("span.archive-post-date")
-                        
-                        auteur = auteur_elem.get_text(strip=True) if auteur_elem else "Auteur inconnu"
-                        date_str = date_elem.get_text(strip=True) if date_elem else "Date inconnue"
-                        
-                        # Parser la date
-                        article_date = self.parse_french_date(date_str)
-                        
-                        # Vérifier si dans la période
-                        if article_date:
-                            if self.is_date_in_range(article_date, start_date, end_date):
-                                # Récupérer le contenu
-                                article_soup = self.get_soup(article_url)
-                                if article_soup:
-                                    content_tag = article_soup.select_one("div.articleLeftContainer article div.article-detail-content123")
-                                    contenu = content_tag.get_text(separator="\n", strip=True) if content_tag else "Contenu vide"
-                                    
-                                    self.all_articles.append({
-                                        "source": "Senego",
-                                        "theme_original": theme,
-                                        "titre": titre,
-                                        "date": date_str,
-                                        "date_parsed": article_date.strftime('%Y-%m-%d'),
-                                        "auteur": auteur,
-                                        "contenu": contenu,
-                                        "url": article_url,
-                                        "rubrique": theme
-                                    })
-                                    
-                                    self.existing_urls.add(article_url)  # Ajouter à la liste des URLs existantes
-                                    page_articles_in_range += 1
-                                    theme_articles_found += 1
-                                    articles_found += 1
-                                    print(f"✅ Nouvel article ajouté: {titre[:50]}...")
-                            elif article_date < start_date:
-                                page_articles_too_old += 1
-                        
-                        time.sleep(0.5)
+            url = f"{base_link}/page/{page_num}" if page_num > 1 else base_link
+            print(f"📄 Page {page_num}")
+            
+            # Reprise: page déjà traitée lors du run interrompu
+            listing = self.get_listing_checkpoint(url)
+            if listing is not None:
+                print("⏭️ Page déjà traitée (reprise)")
+                should_continue_theme = not listing['stop']
+                continue
+            
+            soup = self.get_soup(url)
+            if not soup:
+                # Thème non terminé: il sera repris à partir de cette page au prochain lancement
+                self.incomplete_sections.add(section)
+                self.flush_articles()
+                print(f"⚠️ Thème {theme} incomplet: page {page_num} inaccessible")
+                print(f"📊 Thème {theme}: {theme_articles_found} nouveaux articles")
+                return theme_articles_found
+            
+            articles = soup.select("section.sectionWithSidebar section.postsSectionCenter article")
+            if not articles:
+                should_continue_theme = False
+                break
+            
+            page_articles_in_range = 0
+            page_articles_too_old = 0
+            articles_skipped_duplicate = 0
+            
+            for article in articles:
+                try:
+                    title_tag = article.select_one("h2.archive-post-title a")
+                    if not title_tag:
+                        continue
                         
-                    except Exception as e:
-                        print(f"❌ Erreur article Senego: {e}")
-                
-                print(f"📊 Page {page_num}: {page_articles_in_range} nouveaux, {articles_skipped_duplicate} doublons")
-                
-                # Arrêter si tous les articles sont trop anciens
-                if page_articles_too_old > 0 and page_articles_in_range == 0:
-                    print(f"🛑 Arrêt thème {theme}: articles trop anciens")
-                    should_continue_theme = False
-                
-                time.sleep(1)
+                    titre = title_tag.get_text(strip=True)
+                    article_url = title_tag['href']
+                    
+                    # Vérifier si l'article existe déjà
+                    if self.is_duplicate_url(article_url):
+                        articles_skipped_duplicate += 1
+                        continue
+                    
+                    auteur_elem = article.select_one("span.archive-post-author")
+                    date_elem = article.select_one("span.archive-post-date")
+                    
+                    auteur = auteur_elem.get_text(strip=True) if auteur_elem else "Auteur inconnu"
+                    date_str = date_elem.get_text(strip=True) if date_elem else "Date inconnue"
+                    
+                    # Parser la date
+                    article_date = self.parse_french_date(date_str)
+                    
+                    # Vérifier si dans la période
+                    if article_date:
+                        if self.is_date_in_range(article_date, start_date, end_date):
+                            # Récupérer le contenu
+                            article_soup = self.get_soup(article_url)
+                            if article_soup:
+                                content_tag = article_soup.select_one("div.articleLeftContainer article div.article-detail-content123")
+                                contenu = content_tag.get_text(separator="\n", strip=True) if content_tag else "Contenu vide"
+                                
+                                self.add_article({
+                                    "source": "Senego",
+                                    "theme_original": theme,
+                                    "titre": titre,
+                                    "date": date_str,
+                                    "date_parsed": article_date.strftime('%Y-%m-%d'),
+                                    "auteur": auteur,
+                                    "contenu": contenu,
+                                    "url": article_url,
+                                    "rubrique": theme
+                                })
+                                
+                                page_articles_in_range += 1
+                                theme_articles_found += 1
+                                print(f"✅ Nouvel article ajouté: {titre[:50]}...")
+                        elif article_date < start_date:
+                            page_articles_too_old += 1
+                    
+                    time.sleep(0.5)
+                    
+                except Exception as e:
+                    print(f"❌ Erreur article Senego: {e}")
+            
+            print(f"📊 Page {page_num}: {page_articles_in_range} nouveaux, {articles_skipped_duplicate} doublons")
+            
+            # Arrêter si tous les articles sont trop anciens
+            if page_articles_too_old > 0 and page_articles_in_range == 0:
+                print(f"🛑 Arrêt thème {theme}: articles trop anciens")
+                should_continue_theme = False
             
+            self.finish_listing(url, stop=not should_continue_theme)
+            time.sleep(1)
+        
+        if should_continue_theme:
+            # max_pages atteint sans remonter jusqu'à start_date
+            self.incomplete_sections.add(section)
+            self.flush_articles()
+            print(f"⚠️ Thème {theme} incomplet: {max_pages} pages parcourues sans atteindre le {start_date.strftime('%d/%m/%Y')}")
             print(f"📊 Thème {theme}: {theme_articles_found} nouveaux articles")
+            return theme_articles_found
         
-        print(f"✅ Senego terminé: {articles_found} nouveaux articles récupérés")
-        return articles_found
+        self.finish_section(section)
+        print(f"📊 Thème {theme}: {theme_articles_found} nouveaux articles")
+        return theme_articles_found
     
     def process_themes(self):
         """Traite et harmonise tous les thèmes après collecte"""
@@ -560,9 +890,11 @@ class UnifiedNewsScraper:
         existing_columns = [col for col in columns_order if col in combined_df.columns]
         combined_df = combined_df[existing_columns]
         
-        # Sauvegarder
+        # Sauvegarder (écriture atomique: le fichier peut être lu par d'autres processus)
         try:
-            combined_df.to_csv(self.main_csv_file, index=False, encoding='utf-8')
+            tmp_file = self.main_csv_file + '.tmp'
+            combined_df.to_csv(tmp_file, index=False, encoding='utf-8')
+            os.replace(tmp_file, self.main_csv_file)
             print(f"💾 Fichier principal mis à jour: {self.main_csv_file}")
             print(f"📊 Total articles: {len(combined_df)}")
             
@@ -587,6 +919,28 @@ class UnifiedNewsScraper:
             print(f"❌ Erreur sauvegarde: {e}")
             return False
     
+    def merge_batch(self, articles):
+        """Harmonise les thèmes d'un lot d'articles et le fusionne dans le fichier principal"""
+        self.all_articles = articles
+        with phase('process_themes'):
+            self.process_themes()
+        success = self.merge_and_save_data()
+        self.all_articles = []
+        return success
+    
+    def merge_journal(self, batch_size=1000):
+        """Fusionne le journal du checkpoint par lots, sans le charger entièrement en mémoire"""
+        batch = []
+        for record in self.checkpoint.iter_records():
+            batch.append(record)
+            if len(batch) >= batch_size:
+                if not self.merge_batch(batch):
+                    return False
+                batch = []
+        if batch:
+            return self.merge_batch(batch)
+        return True
+    
     def scrape_all(self, days_back=1, max_pages=10):
         """Scraper les deux sites et fusionner avec les données existantes"""
         print(f"🚀 SCRAPER UNIFIÉ - Récupération des {days_back} derniers jours")
@@ -595,17 +949,31 @@ class UnifiedNewsScraper:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
         
+        # Checkpoint: reprendre un run interrompu (même fenêtre de dates)
+        if self.checkpoint_dir:
+            start_date, end_date = self.open_checkpoint(
+                {'days_back': days_back, 'max_pages': max_pages}, start_date, end_date
+            )
+        
         print(f"📅 Période: {start_date.strftime('%d/%m/%Y %H:%M')} - {end_date.strftime('%d/%m/%Y %H:%M')}")
         print(f"📂 URLs existantes chargées: {len(self.existing_urls)}")
         
-        # Scraper les deux sites
-        senenews_count = self.scrape_senenews(start_date, end_date, max_pages)
-        senego_count = self.scrape_senego(start_date, end_date, max_pages)
-        
-        # Traiter les thèmes après collecte
-        self.process_themes()
+        # Scraper les deux sites (le tampon est écrit dans le journal même en cas d'interruption)
+        try:
+            with phase('scrape_senenews'):
+                senenews_count = self.scrape_senenews(start_date, end_date, max_pages)
+            with phase('scrape_senego'):
+                senego_count = self.scrape_senego(start_date, end_date, max_pages)
+        except BaseException:
+            self.flush_articles()
+            raise
         
-        total_new_articles = len(self.all_articles)
+        # Les articles collectés (y compris ceux d'un run interrompu) sont dans le journal
+        if self.checkpoint:
+            self.flush_articles()
+            total_new_articles = sum(1 for _ in self.checkpoint.iter_records())
+        else:
+            total_new_articles = len(self.all_articles)
         
         print(f"\n🎉 RÉSUMÉ FINAL:")
         print(f"   📰 SeneNews: {senenews_count} nouveaux articles")
@@ -614,16 +982,35 @@ class UnifiedNewsScraper:
         
         # Fusionner et sauvegarder
         if total_new_articles > 0:
-            success = self.merge_and_save_data()
-            return success
+            with phase('merge_and_save'):
+                if self.checkpoint:
+                    success = self.merge_journal()
+                else:
+                    success = self.merge_batch(self.all_articles)
         else:
             print("ℹ️ Aucun nouvel article trouvé")
-            return False
+            success = False
+        
+        # Le journal n'est supprimé qu'une fois les données fusionnées ; si des
+        # sections sont incomplètes, la frontière est gardée pour les reprendre
+        if self.checkpoint and (success or total_new_articles == 0):
+            if self.incomplete_sections:
+                print(f"⚠️ Sections incomplètes, reprise au prochain lancement: {sorted(self.incomplete_sections)}")
+                self.checkpoint.clear_records()
+            else:
+                self.checkpoint.clear()
+        
+        return success
 
 def main():
-    scraper = UnifiedNewsScraper()
+    # python scraper.py [--profile]
+    profile = profiling.profiling_requested()
+    if profile:
+        profiling.start('scraper')
     
     try:
+        scraper = UnifiedNewsScraper()
+        
         # Scraper les deux sites et fusionner
         success = scraper.scrape_all(days_back=1, max_pages=15)
         
@@ -642,6 +1029,9 @@ def main():
     except Exception as e:
         print(f"\n❌ Erreur pendant le scraping: {e}")
         sys.exit(1)
+    finally:
+        if profile:
+            profiling.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
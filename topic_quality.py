@@ -0,0 +1,101 @@
+# Cohérence des topics (UMass / NPMI) calculée de manière vectorisée
+#
+# Les co-occurrences documentaires des mots candidats sont obtenues en une
+# seule multiplication de matrices creuses (Xb.T @ Xb sur les colonnes utiles),
+# puis les scores de tous les topics sont calculés par indexation numpy. La
+# matrice binaire Xb est calculée une fois par entraînement et réutilisée par
+# chaque essai Optuna et par le rapport final.
+
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def binarize(X):
+    """Matrice document x mot binaire au format CSC (colonnes rapides à extraire)"""
+    Xb = sp.csc_matrix(X, dtype=np.float64, copy=True)
+    Xb.data[:] = 1.0
+    return Xb
+
+
+def top_word_indices(components, top_n=10):
+    """Indices des ``top_n`` mots les plus probables de chaque topic (par ordre décroissant)"""
+    top_n = min(top_n, components.shape[1])
+    top = np.argpartition(-components, top_n - 1, axis=1)[:, :top_n]
+    order = np.argsort(-np.take_along_axis(components, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+class CooccurrenceIndex:
+    """Fréquences et co-occurrences documentaires d'un ensemble de mots"""
+
+    def __init__(self, Xb, term_indices):
+        self.terms = np.unique(np.asarray(term_indices).ravel())
+        self.n_docs = Xb.shape[0]
+
+        # Co-occurrences restreintes aux mots candidats (Xb issu de binarize)
+        Xt = Xb[:, self.terms]
+        self.cooccurrence = (Xt.T @ Xt).toarray()
+        self.doc_freq = np.diag(self.cooccurrence).copy()
+
+    def _pair_counts(self, top_idx):
+        pos = np.searchsorted(self.terms, np.asarray(top_idx))
+        co = self.cooccurrence[pos[:, :, None], pos[:, None, :]]
+        df = self.doc_freq[pos]
+        # Paires (i, j) avec j mieux classé que i
+        n = pos.shape[1]
+        pairs = np.tril(np.ones((n, n), dtype=bool), -1)
+        return co, df, pairs
+
+    def umass(self, top_idx):
+        """Cohérence UMass de chaque topic: moyenne de log((D(wi, wj) + 1) / D(wj))"""
+        co, df, pairs = self._pair_counts(top_idx)
+        scores = np.log((co + 1.0) / np.maximum(df[:, None, :], 1.0))
+        return scores[:, pairs].mean(axis=1)
+
+    def npmi(self, top_idx):
+        """Cohérence NPMI de chaque topic (−1 pour une paire jamais observée ensemble)"""
+        co, df, pairs = self._pair_counts(top_idx)
+        p_ij = co / self.n_docs
+        p_i = df / self.n_docs
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pmi = np.log(p_ij / (p_i[:, :, None] * p_i[:, None, :]))
+            scores = np.where(p_ij >= 1.0, 1.0, pmi / -np.log(p_ij))
+        scores = np.where(p_ij > 0, scores, -1.0)
+        return scores[:, pairs].mean(axis=1)
+
+
+def topic_coherence(Xb, components, top_n=10):
+    """Cohérences NPMI et UMass de chaque topic d'un modèle"""
+    top = top_word_indices(components, top_n)
+    index = CooccurrenceIndex(Xb, top)
+    return index.npmi(top), index.umass(top)
+
+
+def topic_quality_report(lda, Xb, feature_names, top_n=10):
+    """Rapport de qualité des topics (scores par topic + mots principaux) pour les métadonnées"""
+    start = time.perf_counter()
+    top = top_word_indices(lda.components_, top_n)
+    index = CooccurrenceIndex(Xb, top)
+    npmi = index.npmi(top)
+    umass = index.umass(top)
+    weights = lda.components_.sum(axis=1) / lda.components_.sum()
+
+    topics = [
+        {
+            'topic': i,
+            'weight': round(float(weights[i]), 4),
+            'npmi': round(float(npmi[i]), 4),
+            'umass': round(float(umass[i]), 4),
+            'top_words': [str(feature_names[j]) for j in top[i]],
+        }
+        for i in range(top.shape[0])
+    ]
+    return {
+        'top_n': int(top.shape[1]),
+        'coherence_npmi': float(npmi.mean()),
+        'coherence_umass': float(umass.mean()),
+        'topics': topics,
+        'seconds': round(time.perf_counter() - start, 3),
+    }